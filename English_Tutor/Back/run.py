@@ -1,10 +1,26 @@
-import uvicorn
-
-if __name__ == "__main__":
-    print("🚀 Starting English Tutor Backend...")
-    print("📡 Local URL: http://localhost:8000")
-    print("📚 API Docs: http://localhost:8000/docs") 
-    print("💡 Press Ctrl+C to stop the server")
-    print("-" * 50)
-    
-    uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
\ No newline at end of file
+import os
+
+import uvicorn
+
+if __name__ == "__main__":
+    # Keep per-worker torch thread pools from oversubscribing cores
+    os.environ.setdefault("OMP_NUM_THREADS", "2")
+    os.environ.setdefault("MKL_NUM_THREADS", "2")
+
+    workers = max(1, (os.cpu_count() or 2) // 2)
+
+    print("🚀 Starting English Tutor Backend (production)...")
+    print("📡 Local URL: http://localhost:8000")
+    print(f"👷 Workers: {workers}")
+    print("💡 Press Ctrl+C to stop the server")
+    print("-" * 50)
+
+    uvicorn.run(
+        "main:app",
+        host="0.0.0.0",
+        port=8000,
+        workers=workers,
+        loop="uvloop",
+        http="httptools",
+        reload=False,
+    )
@@ -0,0 +1,55 @@
+import numpy as np
+import torch
+import triton_python_backend_utils as pb_utils
+from transformers import AutoTokenizer, AutoModelForSeq2SeqLM
+
+MODEL_NAME = "deep-learning-analytics/GrammarCorrector"
+
+class TritonPythonModel:
+    def initialize(self, args):
+        print("🚀 Loading grammar model into Triton...")
+        self.tokenizer = AutoTokenizer.from_pretrained(MODEL_NAME)
+        self.model = AutoModelForSeq2SeqLM.from_pretrained(MODEL_NAME)
+        self.model.eval()
+        self.model.config.use_cache = True
+        print("✅ Model loaded!")
+
+    def execute(self, requests):
+        # The dynamic batcher delivers several requests at once; run
+        # them through one padded generate call and split the results
+        texts = []
+        counts = []
+        max_tokens = 128
+        for request in requests:
+            arr = pb_utils.get_input_tensor_by_name(request, "text_input").as_numpy()
+            items = [t.decode("utf-8") if isinstance(t, bytes) else str(t)
+                     for t in arr.reshape(-1)]
+            texts.extend(items)
+            counts.append(len(items))
+            mt = pb_utils.get_input_tensor_by_name(request, "max_tokens")
+            if mt is not None:
+                max_tokens = int(mt.as_numpy().reshape(-1)[0])
+
+        inputs = self.tokenizer(texts, return_tensors="pt", padding=True)
+        with torch.no_grad():
+            output_ids = self.model.generate(
+                **inputs,
+                max_length=min(128, max_tokens),
+                num_beams=2,
+                early_stopping=True,
+                use_cache=True,
+            )
+        decoded = [self.tokenizer.decode(ids, skip_special_tokens=True).strip()
+                   for ids in output_ids]
+
+        responses = []
+        offset = 0
+        for count in counts:
+            chunk = decoded[offset:offset + count]
+            offset += count
+            out = pb_utils.Tensor(
+                "text_output",
+                np.array([c.encode("utf-8") for c in chunk],
+                         dtype=np.object_).reshape(count, 1))
+            responses.append(pb_utils.InferenceResponse(output_tensors=[out]))
+        return responses